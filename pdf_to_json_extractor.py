@@ -1,7 +1,15 @@
 import argparse
+import asyncio
+import concurrent.futures
+import functools
+import hashlib
 import json
+import mmap
 import os
 import re
+import subprocess
+import tempfile
+import traceback
 from io import BytesIO
 import webbrowser
 
@@ -24,43 +32,160 @@ except Exception:
     HAS_FITZ = False
 
 try:
-    from PIL import Image
+    from PIL import Image, ImageStat
     import pytesseract
     HAS_OCR = True
 except Exception:
     HAS_OCR = False
 
+try:
+    import aiopytesseract
+    HAS_AIOPYTESSERACT = True
+except Exception:
+    HAS_AIOPYTESSERACT = False
+
+try:
+    from tesserocr import PyTessBaseAPI, PSM
+    HAS_TESSEROCR = True
+except Exception:
+    HAS_TESSEROCR = False
+
+try:
+    import orjson
+    HAS_ORJSON = True
+except Exception:
+    HAS_ORJSON = False
+
+try:
+    import xxhash
+    HAS_XXHASH = True
+except Exception:
+    HAS_XXHASH = False
+
+try:
+    import pandas as pd
+    HAS_PANDAS = True
+except Exception:
+    HAS_PANDAS = False
+
 
 # --- Utility Functions ---
-def is_heading(text: str) -> bool:
-    """Heuristic to identify headings or section titles."""
+# Patterns compiled once at import; these run inside hot per-block loops.
+_HEADING_RE = re.compile(r'^(introduction|summary|conclusion|background|methodology|results|discussion|references)[:\s]?', re.I)
+_WS_RE = re.compile(r'\s+')
+_BLOCK_SPLIT_RE = re.compile(r'\n\s*\n')
+_DIGIT_RE = re.compile(r'\d')
+_UPPER_RE = re.compile(r'[A-Z]')
+
+@functools.lru_cache(maxsize=4096)
+def is_heading(text, size=None, fontname="", median_size=None) -> bool:
+    """Identify headings, preferring font signals over text heuristics.
+
+    Memoized: section titles repeat across pages of the same document,
+    so most calls after the first page become cache hits.
+    """
     if not text:
         return False
     txt = text.strip()
-    if len(txt) <= 60 and sum(c.isupper() for c in txt) > len(txt) * 0.5:
+    if size and median_size:
+        # Font metadata is deterministic: headings are larger or bold
+        return len(txt) <= 80 and (size > median_size * 1.15 or "Bold" in fontname)
+    # Text-only fallback when font metadata is unavailable
+    if len(txt) <= 60 and len(_UPPER_RE.findall(txt)) > len(txt) * 0.5:
         return True
     if 1 <= len(txt.split()) <= 6 and txt[0].isupper() and txt.endswith(':'):
         return True
-    if re.match(r'^(introduction|summary|conclusion|background|methodology|results|discussion|references)[:\s]?', txt, re.I):
+    if _HEADING_RE.match(txt):
         return True
     return False
 
+def dumps_json(obj, indent=False) -> str:
+    """Serialize to a JSON string, preferring orjson's C encoder.
+
+    orjson handles non-ASCII natively and is several times faster than
+    the stdlib encoder, which matters once OCR output runs to tens of
+    thousands of strings. Falls back to the stdlib when unavailable.
+    """
+    if HAS_ORJSON:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0).decode()
+    return json.dumps(obj, ensure_ascii=False, indent=2 if indent else None)
+
 def clean_text(s: str) -> str:
     """Remove extra spaces/newlines."""
-    return re.sub(r"\s+", " ", s or "").strip()
+    s = s or ""
+    # Fast path: nothing to collapse, skip the regex entirely. Restricted
+    # to ASCII so Unicode whitespace like \xa0 still hits the regex.
+    if (s.isascii() and '\n' not in s and '\t' not in s and '\r' not in s
+            and '\f' not in s and '\v' not in s and '  ' not in s):
+        return s.strip()
+    return _WS_RE.sub(" ", s).strip()
+
+def clean_texts(texts):
+    """Collapse whitespace across many strings in one pass.
+
+    pandas applies the compiled pattern in a single C loop over the whole
+    array, which beats per-string clean_text calls when a page yields
+    hundreds of small blocks. Falls back to the scalar path otherwise.
+    """
+    if HAS_PANDAS and len(texts) > 1:
+        try:
+            return pd.Series(texts).str.replace(_WS_RE, ' ', regex=True).str.strip().tolist()
+        except Exception:
+            pass
+    return [clean_text(t) for t in texts]
 
 
 # --- Extraction Functions ---
 def extract_text_blocks(page):
-    """Extract textual blocks from page."""
-    blocks = []
+    """Extract textual blocks with font metadata from page.
+
+    Groups the page's word stream into lines and blocks on vertical gaps,
+    which avoids the second full layout pass of extract_text and carries
+    size/fontname through so heading detection can use real font signals.
+    """
     try:
-        text = page.extract_text()
-        if text:
-            raw_blocks = re.split(r'\n\s*\n', text)
-            blocks = [b for b in raw_blocks if b.strip()]
+        words = page.extract_words(use_text_flow=True, extra_attrs=["size", "fontname"])
     except Exception:
-        pass
+        words = []
+    if not words:
+        # Fallback: plain text split on blank lines, no font metadata
+        try:
+            text = page.extract_text()
+        except Exception:
+            text = None
+        if not text:
+            return []
+        return [{'text': b, 'size': None, 'fontname': ''}
+                for b in _BLOCK_SPLIT_RE.split(text) if b.strip()]
+
+    # Words into lines: same line while tops are within a small tolerance
+    lines = [[words[0]]]
+    for w in words[1:]:
+        if abs(w['top'] - lines[-1][-1]['top']) <= 3:
+            lines[-1].append(w)
+        else:
+            lines.append([w])
+
+    heights = sorted(line[0]['bottom'] - line[0]['top'] for line in lines)
+    median_height = heights[len(heights) // 2] or 1
+
+    # Lines into blocks: a vertical gap well above line height starts a new block
+    grouped = [[lines[0]]]
+    for prev, line in zip(lines, lines[1:]):
+        if line[0]['top'] - prev[0]['bottom'] > median_height * 1.5:
+            grouped.append([line])
+        else:
+            grouped[-1].append(line)
+
+    blocks = []
+    for block_lines in grouped:
+        text = '\n'.join(' '.join(w['text'] for w in line) for line in block_lines)
+        first_line = block_lines[0]
+        blocks.append({
+            'text': text,
+            'size': max((w.get('size') or 0) for w in first_line) or None,
+            'fontname': first_line[0].get('fontname') or '',
+        })
     return blocks
 
 def organize_sections(blocks):
@@ -69,13 +194,20 @@ def organize_sections(blocks):
     current_section = None
     current_sub = None
 
-    for b in blocks:
-        text = clean_text(b)
+    # Median body font size for the heading comparison
+    sizes = sorted(b['size'] for b in blocks if b.get('size'))
+    median_size = sizes[len(sizes) // 2] if sizes else None
+
+    # Clean all block texts in one vectorized pass
+    cleaned = clean_texts([b['text'] for b in blocks])
+
+    for b, text in zip(blocks, cleaned):
         if not text:
             continue
-        first_line = text.split('\n')[0]
+        raw_lines = b['text'].split('\n')
+        first_line = clean_text(raw_lines[0])
 
-        if is_heading(first_line):
+        if is_heading(first_line, b.get('size'), b.get('fontname') or '', median_size):
             # Decide if section or sub-section
             if current_section is None or len(first_line.split()) <= 3:
                 # New section
@@ -98,7 +230,7 @@ def organize_sections(blocks):
                 else:
                     current_section["sub_sections"].append(current_sub)
             # Add remaining text as paragraph
-            rest = '\n'.join(text.split('\n')[1:]).strip()
+            rest = clean_text(' '.join(raw_lines[1:]))
             if rest:
                 if current_sub:
                     current_sub["paragraphs"].append(rest)
@@ -123,14 +255,27 @@ def organize_sections(blocks):
                 current_section = default_section
     return sections
 
-def extract_tables(pdf_path, page_number, page):
-    """Extract tables using Camelot (preferred) or pdfplumber fallback."""
-    tables = []
+def read_all_tables(pdf_path):
+    """Run Camelot once over the whole document and bucket tables by page.
+
+    Calling camelot.read_pdf per page re-parses the entire PDF each time;
+    a single pages='all' pass costs one parse regardless of page count.
+    """
+    page_tables_map = {}
     if HAS_CAMELOT:
         try:
-            tables = [t.df.values.tolist() for t in camelot.read_pdf(pdf_path, pages=str(page_number))]
+            for t in camelot.read_pdf(pdf_path, pages='all'):
+                # t.data is already the stripped list of lists; going
+                # through t.df would build a DataFrame and an object
+                # array just to convert back
+                page_tables_map.setdefault(t.page, []).append(t.data)
         except Exception:
             pass
+    return page_tables_map
+
+def extract_tables(page_tables, page):
+    """Extract tables using pre-bucketed Camelot results or pdfplumber fallback."""
+    tables = page_tables or []
     if not tables:
         try:
             tables = [[[(cell or "") for cell in row] for row in tbl] for tbl in page.extract_tables()]
@@ -138,25 +283,247 @@ def extract_tables(pdf_path, page_number, page):
             pass
     return [{'type': 'table', 'section': None, 'description': None, 'table_data': t} for t in tables]
 
-def extract_images(pdf_path, page_number, page):
-    """Extract images, apply OCR, classify chart vs image."""
+# OCR pre-filter thresholds: images smaller than this can't hold readable
+# text, and near-uniform images (flat logos, rules) have nothing to OCR.
+MIN_OCR_PIXELS = 10_000
+MIN_OCR_STDDEV = 5.0
+
+# Rasterization DPI for the pdfplumber fallback: render cheap at 72 and
+# re-render at 200 only when Tesseract reports poor confidence (pixel
+# count, and therefore render cost, scales with DPI squared).
+OCR_BASE_DPI = 72
+OCR_RETRY_DPI = 200
+OCR_LOW_CONF = 60
+
+def _render_for_ocr(page, bbox):
+    """Rasterize a bbox at low DPI and OCR it in one pass.
+
+    Returns (image, text). image_to_data both measures confidence and
+    recognizes the words, so its output is kept when confidence is
+    acceptable — one Tesseract run per crop. Only low-confidence crops
+    return text None, along with a 200 DPI re-render for the real OCR
+    pass downstream.
+    """
+    im = page.crop(bbox).to_image(resolution=OCR_BASE_DPI).original
+    try:
+        data = pytesseract.image_to_data(im, output_type=pytesseract.Output.DICT)
+        confs = [int(c) for c in data['conf'] if int(c) >= 0]
+        if confs and sum(confs) / len(confs) < OCR_LOW_CONF:
+            return page.crop(bbox).to_image(resolution=OCR_RETRY_DPI).original, None
+        return im, clean_text(' '.join(w for w in data['text'] if w.strip()))
+    except Exception:
+        return im, None
+
+# OCR results keyed by image-bytes hash so repeated logos (headers/footers)
+# are OCR'd once per worker instead of once per occurrence.
+_OCR_CACHE = {}
+
+def _image_key(img_bytes):
+    """Hash image bytes for the OCR cache.
+
+    Identity, not cryptography, is all the cache needs, so prefer xxhash
+    (an order of magnitude faster than md5 on large images).
+    """
+    if HAS_XXHASH:
+        return xxhash.xxh64(img_bytes).hexdigest()
+    return hashlib.md5(img_bytes).hexdigest()
+
+# Preloaded tesserocr API, created lazily once per worker process so the
+# ~15MB language model is loaded once instead of per subprocess spawn.
+_TESS_API = None
+
+def _get_tess_api():
+    global _TESS_API
+    if _TESS_API is None:
+        _TESS_API = PyTessBaseAPI(lang="eng", psm=PSM.AUTO)
+    return _TESS_API
+
+# Cap on concurrent aiopytesseract subprocesses
+OCR_CONCURRENCY = os.cpu_count() or 1
+
+async def _gather_ocr(image_bytes_list):
+    """Run OCR over several images concurrently, bounded by a semaphore."""
+    sem = asyncio.Semaphore(OCR_CONCURRENCY)
+
+    async def _one(img_bytes):
+        async with sem:
+            return await aiopytesseract.image_to_string(img_bytes)
+
+    return await asyncio.gather(*[_one(b) for b in image_bytes_list])
+
+# Formats Tesseract reads natively; raw bytes in these formats skip the
+# PIL decode + PNG re-encode round trip entirely.
+_RAW_OCR_EXTS = {'png', 'jpg', 'jpeg', 'tif', 'tiff'}
+
+def _batch_ocr(items):
+    """OCR several (image, raw bytes, ext) items with one engine pass.
+
+    Prefers tesserocr's in-process API, which loads the language model
+    once per worker; then aiopytesseract, which runs the Tesseract
+    subprocesses concurrently via asyncio.gather; otherwise falls back to
+    Tesseract's file-list batch mode, which accepts a text file listing
+    image paths and separates the results with form feeds. One
+    pytesseract call per image is the last resort. Wherever the engine
+    reads a file or bytes, images whose native format is one Tesseract
+    understands are passed through untouched rather than re-encoded.
+    """
+    if not items:
+        return []
+    if HAS_TESSEROCR:
+        try:
+            api = _get_tess_api()
+            texts = []
+            for im, _, _ in items:
+                api.SetImage(im)
+                texts.append(clean_text(api.GetUTF8Text()))
+            return texts
+        except Exception:
+            pass
+    if HAS_AIOPYTESSERACT and len(items) > 1:
+        try:
+            bufs = []
+            for im, img_bytes, ext in items:
+                if ext in _RAW_OCR_EXTS:
+                    bufs.append(img_bytes)
+                else:
+                    buf = BytesIO()
+                    im.save(buf, format="PNG")
+                    bufs.append(buf.getvalue())
+            return [clean_text(t) for t in asyncio.run(_gather_ocr(bufs))]
+        except Exception:
+            pass
+    if len(items) > 1:
+        try:
+            with tempfile.TemporaryDirectory() as tmpdir:
+                paths = []
+                for idx, (im, img_bytes, ext) in enumerate(items):
+                    if ext in _RAW_OCR_EXTS:
+                        path = os.path.join(tmpdir, f"img{idx}.{ext}")
+                        with open(path, "wb") as f:
+                            f.write(img_bytes)
+                    else:
+                        path = os.path.join(tmpdir, f"img{idx}.png")
+                        im.save(path, format="PNG")
+                    paths.append(path)
+                list_path = os.path.join(tmpdir, "images.txt")
+                with open(list_path, "w", encoding="utf-8") as f:
+                    f.write("\n".join(paths))
+                out_base = os.path.join(tmpdir, "ocr")
+                subprocess.run(
+                    [pytesseract.pytesseract.tesseract_cmd, list_path, out_base],
+                    check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+                )
+                with open(out_base + ".txt", encoding="utf-8") as f:
+                    texts = f.read().split("\f")
+            if len(texts) >= len(items):
+                return [clean_text(t) for t in texts[:len(items)]]
+        except Exception:
+            pass
+    texts = []
+    for im, img_bytes, ext in items:
+        try:
+            texts.append(_single_ocr(im, img_bytes, ext))
+        except Exception:
+            # A bad image or missing engine loses this image's text only
+            texts.append("")
+    return texts
+
+def _single_ocr(im, img_bytes, ext):
+    """OCR one image via pytesseract, using the raw bytes when possible."""
+    if ext in _RAW_OCR_EXTS:
+        try:
+            with tempfile.NamedTemporaryFile(suffix=f".{ext}", delete=False) as tmp:
+                tmp.write(img_bytes)
+            try:
+                # A path string goes straight to the tesseract binary with
+                # no PIL decode/re-encode on the way
+                return clean_text(pytesseract.image_to_string(tmp.name))
+            finally:
+                os.unlink(tmp.name)
+        except Exception:
+            pass
+    try:
+        return clean_text(pytesseract.image_to_string(im))
+    except Exception:
+        return ""
+
+def _ocr_images(entries):
+    """Resolve OCR text for (image, raw bytes, ext) entries, batching misses.
+
+    Applies the size/uniformity pre-filters and the md5 cache first, then
+    sends all remaining images through a single batched Tesseract call.
+    """
+    texts = [None] * len(entries)
+    pending = []
+    for i, (im, img_bytes, ext) in enumerate(entries):
+        try:
+            if im.size[0] * im.size[1] < MIN_OCR_PIXELS:
+                texts[i] = ""
+                continue
+            key = _image_key(img_bytes)
+            if key in _OCR_CACHE:
+                texts[i] = _OCR_CACHE[key]
+                continue
+            # The stddev check triggers PIL's lazy decode, which can
+            # raise on a truncated image; degrade just that image
+            if ImageStat.Stat(im.convert("L")).stddev[0] < MIN_OCR_STDDEV:
+                texts[i] = _OCR_CACHE[key] = ""
+                continue
+        except Exception:
+            texts[i] = ""
+            continue
+        pending.append((i, key, (im, img_bytes, ext)))
+    for (i, key, _), text in zip(pending, _batch_ocr([p[2] for p in pending])):
+        texts[i] = _OCR_CACHE[key] = text
+    return texts
+
+# fitz.Document handles cached per worker process; re-opening per page
+# re-parses the xref table every time, which adds up on large PDFs.
+_FITZ_DOCS = {}
+
+def _get_fitz_doc(pdf_path):
+    """Return a cached fitz.Document for this (process, path) pair."""
+    key = (os.getpid(), pdf_path)
+    doc = _FITZ_DOCS.get(key)
+    if doc is None:
+        doc = _FITZ_DOCS[key] = fitz.open(pdf_path)
+    return doc
+
+def extract_images(pdf_path, page_number, page, ocr=True):
+    """Extract images, optionally apply OCR, classify chart vs image."""
     results = []
+
+    # Born-digital pages already carry their content in the text layer;
+    # record the images from the page metadata alone, without rendering
+    # or decoding anything, unless OCR was requested
+    if not ocr:
+        count = 0
+        if HAS_FITZ:
+            try:
+                doc = _get_fitz_doc(pdf_path)
+                count = len(doc[page_number - 1].get_images(full=True))
+            except Exception:
+                pass
+        else:
+            try:
+                count = len(page.images)
+            except Exception:
+                pass
+        return [{'type': 'image', 'section': None, 'description': None, 'table_data': None}
+                for _ in range(count)]
+
+    # Each item is either text recognized during rendering ('text') or an
+    # (image, raw bytes, ext) tuple still needing OCR ('entry')
+    items = []
     if HAS_FITZ and HAS_OCR:
         try:
-            doc = fitz.open(pdf_path)
+            doc = _get_fitz_doc(pdf_path)
             page_fitz = doc[page_number - 1]
             for img in page_fitz.get_images(full=True):
-                base_img = doc.extract_image(img[0])
                 try:
-                    im = Image.open(BytesIO(base_img["image"]))
-                    text = clean_text(pytesseract.image_to_string(im))
-                    table_data = [] if re.search(r'\d', text) else None
-                    results.append({
-                        'type': 'chart' if table_data is not None else 'image',
-                        'section': None,
-                        'description': text or None,
-                        'table_data': table_data
-                    })
+                    base_img = doc.extract_image(img[0])
+                    items.append(('entry', (Image.open(BytesIO(base_img["image"])),
+                                            base_img["image"], base_img.get("ext"))))
                 except Exception:
                     continue
         except Exception:
@@ -166,39 +533,235 @@ def extract_images(pdf_path, page_number, page):
             for img in page.images:
                 try:
                     bbox = (img['x0'], img['top'], img['x1'], img['bottom'])
-                    im = page.crop(bbox).to_image(resolution=150).original
-                    text = clean_text(pytesseract.image_to_string(im))
-                    table_data = [] if re.search(r'\d', text) else None
-                    results.append({
-                        'type': 'chart' if table_data is not None else 'image',
-                        'section': None,
-                        'description': text or None,
-                        'table_data': table_data
-                    })
+                    im, text = _render_for_ocr(page, bbox)
+                    if text is not None:
+                        # The render pass already OCR'd this crop
+                        items.append(('text', text))
+                    else:
+                        # Rendered crops have no native file format; the raw
+                        # pixel bytes are only used as the cache key
+                        items.append(('entry', (im, im.tobytes(), None)))
                 except Exception:
                     continue
         except Exception:
             pass
+
+    # OCR the still-unresolved images in one batched pass
+    ocr_iter = iter(_ocr_images([val for kind, val in items if kind == 'entry']))
+    for kind, val in items:
+        text = val if kind == 'text' else next(ocr_iter)
+        table_data = [] if _DIGIT_RE.search(text) else None
+        results.append({
+            'type': 'chart' if table_data is not None else 'image',
+            'section': None,
+            'description': text or None,
+            'table_data': table_data
+        })
     return results
 
+def ocr_full_page(pdf_path, page_number):
+    """OCR a scanned page wholesale from a rendered pixmap.
+
+    Scanned pages carry all their content as one big image, so rendering
+    the page once and OCRing it beats extracting and OCRing the embedded
+    image objects individually, and yields text in reading order that can
+    be organized into sections like a born-digital page.
+    """
+    if not (HAS_FITZ and HAS_OCR):
+        return []
+    try:
+        doc = _get_fitz_doc(pdf_path)
+        pix = doc[page_number - 1].get_pixmap(dpi=150)
+        im = Image.open(BytesIO(pix.tobytes("png")))
+        if HAS_TESSEROCR:
+            api = _get_tess_api()
+            api.SetImage(im)
+            text = api.GetUTF8Text()
+        else:
+            text = pytesseract.image_to_string(im)
+    except Exception:
+        return []
+    blocks = [{'text': b, 'size': None, 'fontname': ''}
+              for b in _BLOCK_SPLIT_RE.split(text or '') if b.strip()]
+    return organize_sections(blocks)
+
 # --- Main Processing ---
-def build_json(pdf_path: str) -> dict:
-    """Process PDF and build structured JSON with nested sections/sub-sections."""
-    result = {'pages': []}
-    with pdfplumber.open(pdf_path) as pdf:
-        for i, page in enumerate(pdf.pages, start=1):
-            page_content = []
+# Processed pages are cached on disk keyed by md5 of the input file, so
+# re-running on an unchanged PDF skips parsing and OCR entirely. The
+# per-page layout lets a partial run resume page by page.
+CACHE_ROOT = os.path.expanduser(os.path.join("~", ".cache", "pdf_to_json"))
 
-            # Extract text blocks
-            blocks = extract_text_blocks(page)
-            page_content.extend(organize_sections(blocks))
+def _pdf_cache_dir(pdf_path, ocr_images=False):
+    """Return (and create) the per-document cache directory, or None."""
+    try:
+        with open(pdf_path, 'rb') as f:
+            h = hashlib.md5(f.read()).hexdigest()
+        # Runs with image OCR enabled produce different content, so they
+        # get their own cache directory
+        cache_dir = os.path.join(CACHE_ROOT, "pdfs", h + ("-ocr" if ocr_images else ""))
+        os.makedirs(cache_dir, exist_ok=True)
+        return cache_dir
+    except Exception:
+        return None
 
-            # Extract tables and images
-            page_content.extend(extract_tables(pdf_path, i, page))
-            page_content.extend(extract_images(pdf_path, i, page))
+def _load_cached_page(cache_dir, page_number):
+    if not cache_dir:
+        return None
+    try:
+        with open(os.path.join(cache_dir, f"page{page_number}.json"), encoding="utf-8") as f:
+            return json.load(f)
+    except Exception:
+        return None
+
+def _store_cached_page(cache_dir, page_number, page_dict):
+    if not cache_dir:
+        return
+    try:
+        with open(os.path.join(cache_dir, f"page{page_number}.json"), "w", encoding="utf-8") as f:
+            f.write(dumps_json(page_dict))
+    except Exception:
+        pass
 
-            result['pages'].append({'page_number': i, 'content': page_content})
-    return result
+def _open_pdf(pdf_path):
+    """Open a PDF with pdfplumber through a memory-mapped view of the file.
+
+    mmap lets the OS page the file in on demand and serve pdfminer's many
+    small seeks from the page cache, which beats buffered file I/O on very
+    large or network-mounted PDFs. Falls back to a plain open on failure.
+    """
+    try:
+        with open(pdf_path, 'rb') as f:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return pdfplumber.open(mm)
+    except Exception:
+        return pdfplumber.open(pdf_path)
+
+def _page_has_images(pdf_path, page_number):
+    """Cheap header-only check for Image XObjects on a page.
+
+    get_images(full=False) reads only the page's Resources dict, without
+    decompressing any image streams, so text-only pages can skip the
+    whole image/OCR path for the cost of a dict lookup.
+    """
+    if not HAS_FITZ:
+        return True
+    try:
+        doc = _get_fitz_doc(pdf_path)
+        return bool(doc[page_number - 1].get_images(full=False))
+    except Exception:
+        return True
+
+def _get_max_workers() -> int:
+    """Worker count for page-level parallelism (Tesseract is itself multi-threaded)."""
+    return max(1, (os.cpu_count() or 1) // 4)
+
+# A page with at least this many chars in its text layer is born-digital;
+# below it the text layer is noise and the page is treated as a scan.
+BORN_DIGITAL_MIN_CHARS = 100
+
+def process_page(pdf_path: str, page_number: int, page_tables: list,
+                 cache_dir=None, ocr_images=False) -> dict:
+    """Process a single page and return its structured content.
+
+    Failures are re-raised as plain RuntimeErrors carrying the formatted
+    traceback: exception types that don't survive pickling (for example
+    pytesseract's TesseractNotFoundError) would otherwise kill the worker
+    during result transfer and abort the whole pool as an opaque
+    BrokenProcessPool.
+    """
+    try:
+        return _process_page(pdf_path, page_number, page_tables, cache_dir, ocr_images)
+    except Exception:
+        raise RuntimeError(
+            f"page {page_number} failed:\n{traceback.format_exc()}"
+        ) from None
+
+def _process_page(pdf_path, page_number, page_tables, cache_dir, ocr_images):
+    cached = _load_cached_page(cache_dir, page_number)
+    if cached is not None:
+        return cached
+
+    with _open_pdf(pdf_path) as pdf:
+        page = pdf.pages[page_number - 1]
+        page_content = []
+
+        # Extract text blocks
+        blocks = extract_text_blocks(page)
+        text_len = sum(len(b['text']) for b in blocks)
+
+        # The remaining phases are independent; OCR and table extraction
+        # both release the GIL (subprocess / C), so running them on
+        # threads overlaps their wall time within the page.
+        with concurrent.futures.ThreadPoolExecutor(max_workers=3) as ex:
+            futures = []
+
+            if text_len >= BORN_DIGITAL_MIN_CHARS:
+                # Born-digital: the text layer is authoritative. Embedded
+                # images are still recorded but only OCR'd on request.
+                futures.append(ex.submit(organize_sections, blocks))
+                f_tables = ex.submit(extract_tables, page_tables, page)
+                futures.append(f_tables)
+
+                # Text-heavy pages with no Image XObjects skip the fitz path
+                if text_len <= 500 or _page_has_images(pdf_path, page_number):
+                    if HAS_FITZ:
+                        futures.append(ex.submit(extract_images, pdf_path, page_number, page, ocr_images))
+                    else:
+                        # Without fitz, image crops render through the same
+                        # pdfplumber page the table fallback may read, and
+                        # the underlying pdfminer stream is not thread-safe
+                        # — wait for tables before touching the page.
+                        def _images_after_tables():
+                            f_tables.result()
+                            return extract_images(pdf_path, page_number, page, ocr_images)
+                        futures.append(ex.submit(_images_after_tables))
+            else:
+                # Scanned: no usable text layer, so text and table
+                # extraction have nothing to work with — OCR the whole
+                # page once instead.
+                futures.append(ex.submit(ocr_full_page, pdf_path, page_number))
+
+            for f in futures:
+                page_content.extend(f.result())
+
+        result = {'page_number': page_number, 'content': page_content}
+        _store_cached_page(cache_dir, page_number, result)
+        return result
+
+def iter_pages(pdf_path: str, ocr_images: bool = False):
+    """Yield structured per-page dicts in page order.
+
+    Pages are independent, so they are processed in parallel across worker
+    processes (OCR and table extraction dominate wall time on most PDFs)
+    and streamed out as they finish, so callers can serialize
+    incrementally instead of holding the whole document in memory.
+    """
+    with _open_pdf(pdf_path) as pdf:
+        num_pages = len(pdf.pages)
+
+    cache_dir = _pdf_cache_dir(pdf_path, ocr_images)
+
+    # Fully cached document: skip Camelot and the worker pool entirely
+    cached_pages = [_load_cached_page(cache_dir, i) for i in range(1, num_pages + 1)]
+    if all(p is not None for p in cached_pages):
+        yield from cached_pages
+        return
+
+    # One Camelot pass over the whole document instead of one per page
+    page_tables_map = read_all_tables(pdf_path)
+
+    with concurrent.futures.ProcessPoolExecutor(max_workers=_get_max_workers()) as executor:
+        # Each worker only needs its own page's tables; shipping the whole
+        # map would pickle every table once per page
+        futures = [executor.submit(process_page, pdf_path, i,
+                                   page_tables_map.get(i, []), cache_dir, ocr_images)
+                   for i in range(1, num_pages + 1)]
+        for future in futures:
+            yield future.result()
+
+def build_json(pdf_path: str, ocr_images: bool = False) -> dict:
+    """Process PDF and build structured JSON with nested sections/sub-sections."""
+    return {'pages': list(iter_pages(pdf_path, ocr_images))}
 
 def main():
     parser = argparse.ArgumentParser(description="Extract structured JSON from a PDF")
@@ -212,6 +775,11 @@ def main():
         default="output.json",
         help="Output JSON file path"
     )
+    parser.add_argument(
+        "--ocr-images",
+        action="store_true",
+        help="Also OCR embedded images on born-digital pages (slower)"
+    )
     args = parser.parse_args()
 
     if not os.path.isfile(args.input):
@@ -219,10 +787,15 @@ def main():
         return
 
     print(f"Processing: {args.input}")
-    data = build_json(args.input)
 
+    # Stream pages to disk as they complete instead of holding them all
     with open(args.output, "w", encoding="utf-8") as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
+        f.write('{"pages": [')
+        for idx, page in enumerate(iter_pages(args.input, ocr_images=args.ocr_images)):
+            if idx:
+                f.write(',\n')
+            f.write(dumps_json(page, indent=True))
+        f.write(']}')
 
     print(f"JSON saved to: {args.output}")
 